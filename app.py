@@ -10,14 +10,85 @@ This Dash application visualizes Pink Morsel sales data and allows users to:
 import dash
 from dash import dcc, html, callback, Output, Input
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
 
-# Load the processed data
-df = pd.read_csv('data/formatted_sales_data.csv')
-df['Date'] = pd.to_datetime(df['Date'])
 
-# Get unique regions for the radio buttons
-regions = ['all'] + sorted(df['Region'].unique().tolist())
+def split_sum(dates, sales, pivot):
+    """
+    Sum sales before and on/after the pivot date.
+    The dates are sorted, so the split point is a single binary search.
+    """
+    i = np.searchsorted(dates, pivot)
+    return float(sales[:i].sum(dtype='float64')), float(sales[i:].sum(dtype='float64'))
+
+
+# January 15, 2021, the date the summary stats are split on
+JAN15 = pd.Timestamp('2021-01-15')
+
+# Load the processed data (Parquet cache written by data_processor.py)
+df = pd.read_parquet('data/formatted_sales_data.parquet', dtype_backend='pyarrow')
+df['Region'] = df['Region'].astype('category').cat.remove_unused_categories()
+
+# Get the regions for the radio buttons from the categorical levels
+# (sorted, and limited to regions that actually have rows)
+regions = ['all'] + df['Region'].cat.categories.tolist()
+
+# Radio button options never change, so build them once
+REGION_OPTIONS = [{'label': r.capitalize() if r != 'all' else 'All Regions', 'value': r} for r in regions]
+
+# Index by (Region, Date) so a region's rows are a sorted index slice
+df = df.set_index(['Region', 'Date']).sort_index()
+
+# Pre-aggregate daily sales per region once, so callbacks are dict lookups
+# (observed=True skips empty groups for unused categories; the index is
+# already sorted by (Region, Date), so sort=False keeps that order for free)
+region_daily = df['Sales'].groupby(level=['Region', 'Date'], observed=True, sort=False).sum()
+DAILY = {'all': df['Sales'].groupby(level='Date').sum()}
+for region in regions[1:]:
+    DAILY[region] = region_daily.loc[region]
+
+# Keep only the raw (dates, sales) NumPy arrays for the chart and stats
+DAILY_NP = {
+    r: (s.index.to_numpy(dtype='datetime64[ns]'), s.to_numpy(dtype='float32'))
+    for r, s in DAILY.items()
+}
+
+# Pre-compute (total, average, before Jan 15, after Jan 15) sales per region
+STATS = {}
+for region, (dates, sales) in DAILY_NP.items():
+    before_jan15, after_jan15 = split_sum(dates, sales, JAN15.to_datetime64())
+    STATS[region] = (
+        float(sales.sum(dtype='float64')),
+        float(sales.mean(dtype='float64')),
+        before_jan15,
+        after_jan15
+    )
+
+# Chart styling shared by every region's figure
+LINE_STYLE = dict(color='#00d4ff', width=2)
+BASE_LAYOUT = dict(
+    template='plotly_dark',
+    paper_bgcolor='#16213e',
+    plot_bgcolor='#0f3460',
+    font=dict(color='#ffffff'),
+    title=dict(
+        font=dict(size=18, color='#e94560'),
+        x=0.5
+    ),
+    xaxis=dict(
+        title='Date',
+        gridcolor='#1a1a2e',
+        showgrid=True
+    ),
+    yaxis=dict(
+        title='Sales ($)',
+        gridcolor='#1a1a2e',
+        showgrid=True,
+        tickformat='$,.0f'
+    ),
+    hovermode='x unified'
+)
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
@@ -82,7 +153,7 @@ app.layout = html.Div(
                 ),
                 dcc.RadioItems(
                     id='region-radio',
-                    options=[{'label': r.capitalize() if r != 'all' else 'All Regions', 'value': r} for r in regions],
+                    options=REGION_OPTIONS,
                     value='all',
                     style={
                         'color': '#ffffff',
@@ -149,76 +220,49 @@ app.layout = html.Div(
 )
 
 
-@callback(
-    [Output('sales-chart', 'figure'),
-     Output('summary-stats', 'children')],
-    [Input('region-radio', 'value')]
-)
-def update_chart(selected_region):
-    """Update the chart and summary stats based on selected region."""
+def build_figure(selected_region):
+    """Build the sales chart for a region."""
     
-    # Filter data based on selected region
     if selected_region == 'all':
-        filtered_df = df.copy()
         title = "Pink Morsel Sales Over Time - All Regions"
     else:
-        filtered_df = df[df['Region'] == selected_region]
         title = f"Pink Morsel Sales Over Time - {selected_region.capitalize()} Region"
     
-    # Aggregate sales by date
-    daily_sales = filtered_df.groupby('Date')['Sales'].sum().reset_index()
+    # Look up the pre-aggregated daily sales for the region
+    dates, sales = DAILY_NP[selected_region]
     
-    # Create the line chart
-    fig = px.line(
-        daily_sales,
-        x='Date',
-        y='Sales',
-        title=title,
-        template='plotly_dark'
+    # Create the line chart (WebGL trace built directly from the arrays)
+    fig = go.Figure(
+        go.Scattergl(
+            x=dates,
+            y=sales,
+            name='',
+            mode='lines',
+            line=LINE_STYLE,
+            hovertemplate='Date=%{x}<br>Sales=%{y}<extra></extra>',
+            showlegend=False
+        ),
+        layout=BASE_LAYOUT
     )
+    fig.update_layout(title_text=title)
     
     # Add a vertical line at January 15, 2021
-    jan_15_2021 = pd.to_datetime('2021-01-15')
     fig.add_vline(
-        x=jan_15_2021,
+        x=JAN15,
         line_dash="dash",
         line_color="#e94560",
         annotation_text="Jan 15, 2021",
         annotation_position="top"
     )
     
-    # Customize the chart appearance
-    fig.update_traces(
-        line=dict(color='#00d4ff', width=2),
-        mode='lines'
-    )
-    
-    fig.update_layout(
-        paper_bgcolor='#16213e',
-        plot_bgcolor='#0f3460',
-        font=dict(color='#ffffff'),
-        title=dict(
-            font=dict(size=18, color='#e94560'),
-            x=0.5
-        ),
-        xaxis=dict(
-            title='Date',
-            gridcolor='#1a1a2e',
-            showgrid=True
-        ),
-        yaxis=dict(
-            title='Sales ($)',
-            gridcolor='#1a1a2e',
-            showgrid=True,
-            tickformat='$,.0f'
-        ),
-        hovermode='x unified'
-    )
+    return fig
+
+
+def build_summary(selected_region):
+    """Build the summary stats for a region."""
     
-    # Calculate summary statistics
-    # Split data before and after Jan 15, 2021
-    before_jan15 = daily_sales[daily_sales['Date'] < jan_15_2021]['Sales'].sum()
-    after_jan15 = daily_sales[daily_sales['Date'] >= jan_15_2021]['Sales'].sum()
+    # Summary statistics are pre-computed at startup
+    total_sales, avg_daily_sales, before_jan15, after_jan15 = STATS[selected_region]
     
     # Determine which period had higher sales
     if before_jan15 > after_jan15:
@@ -228,9 +272,6 @@ def update_chart(selected_region):
         comparison = "Sales were HIGHER after January 15th, 2021"
         comparison_color = "#ff9800"
     
-    total_sales = daily_sales['Sales'].sum()
-    avg_daily_sales = daily_sales['Sales'].mean()
-    
     # Create summary stats display
     summary = html.Div([
         html.H3("Sales Summary", style={'color': '#e94560', 'marginBottom': '15px'}),
@@ -277,7 +318,23 @@ def update_chart(selected_region):
         )
     ])
     
-    return fig, summary
+    return summary
+
+
+# Build every region's figure and summary once and keep their JSON-ready
+# dicts, so the callback skips construction, formatting, and conversion
+FIG_CACHE = {r: build_figure(r).to_plotly_json() for r in regions}
+SUMMARY_CACHE = {r: build_summary(r).to_plotly_json() for r in regions}
+
+
+@callback(
+    [Output('sales-chart', 'figure'),
+     Output('summary-stats', 'children')],
+    [Input('region-radio', 'value')]
+)
+def update_chart(selected_region):
+    """Update the chart and summary stats based on selected region."""
+    return FIG_CACHE[selected_region], SUMMARY_CACHE[selected_region]
 
 
 if __name__ == '__main__':
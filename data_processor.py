@@ -8,63 +8,139 @@ This script processes the daily sales data files to:
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
 import re
 
-def load_and_process_data(data_dir='data'):
+# Declared schema of the daily_sales_data files, so read_csv skips type inference
+SOURCE_COLUMNS = ['product', 'price', 'quantity', 'date', 'region']
+SOURCE_DTYPES = {'product': 'category', 'region': 'category', 'quantity': 'int32'}
+
+
+def find_csv_files(data_dir='data'):
     """
-    Load all CSV files from the data directory, filter for Pink Morsels,
-    calculate sales, and return a combined DataFrame.
+    Return the paths of all daily_sales_data CSV files in the data directory.
     """
-    all_data = []
-    
-    # Find all daily_sales_data CSV files
     csv_files = sorted([f for f in os.listdir(data_dir) if f.startswith('daily_sales_data') and f.endswith('.csv')])
+    return [os.path.join(data_dir, f) for f in csv_files]
+
+
+def read_sales_file(file_path):
+    """
+    Read a single daily_sales_data CSV file using the declared schema.
+    """
+    print(f"Processing: {file_path}")
+    return pd.read_csv(file_path, usecols=SOURCE_COLUMNS, dtype=SOURCE_DTYPES, engine='c')
+
+
+def process_sales(df):
+    """
+    Filter raw sales rows for Pink Morsels, calculate sales, and return
+    a DataFrame with Sales, Date, and Region columns.
+    """
+    # Filter for pink morsel only
+    df = df[df['product'] == 'pink morsel']
+    
+    # Drop region categories that only had other products, so they are not
+    # carried into the outputs as levels without any rows
+    if isinstance(df['region'].dtype, pd.CategoricalDtype):
+        df['region'] = df['region'].cat.remove_unused_categories()
     
-    for csv_file in csv_files:
-        file_path = os.path.join(data_dir, csv_file)
-        print(f"Processing: {file_path}")
-        
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        
-        # Filter for pink morsel only (case insensitive)
-        df = df[df['product'].str.lower() == 'pink morsel']
-        
-        # Clean the price column (remove $ and convert to float)
-        df['price'] = df['price'].replace(r'[\$,]', '', regex=True).astype(float)
-        
-        # Calculate sales = quantity * price
-        df['sales'] = df['quantity'] * df['price']
-        
-        # Keep only the required columns
-        df = df[['sales', 'date', 'region']]
-        
-        all_data.append(df)
+    # Clean the price column (slice off the leading $, drop any thousands
+    # separators with a plain, non-regex replace, and convert to float)
+    df['price'] = df['price'].str[1:].str.replace(',', '', regex=False).astype('float64')
     
-    # Combine all dataframes
-    combined_df = pd.concat(all_data, ignore_index=True)
+    # Calculate sales = quantity * price
+    df['sales'] = df['quantity'] * df['price']
+    
+    # Keep only the required columns
+    df = df[['sales', 'date', 'region']]
     
     # Rename columns to match expected output format
-    combined_df.columns = ['Sales', 'Date', 'Region']
+    df.columns = ['Sales', 'Date', 'Region']
     
-    return combined_df
+    return df
+
+
+def load_and_process_data(data_dir='data'):
+    """
+    Load all CSV files from the data directory, filter for Pink Morsels,
+    calculate sales, and return a combined DataFrame.
+    """
+    # Read every file into a single frame so the cleaning runs once
+    combined_df = pd.concat([read_sales_file(p) for p in find_csv_files(data_dir)], ignore_index=True)
+    return process_sales(combined_df)
+
+
+def parquet_path_for(output_path):
+    """
+    Return the path of the Parquet copy written alongside a CSV output file.
+    """
+    return os.path.splitext(output_path)[0] + '.parquet'
+
+
+def to_parquet_frame(df):
+    """
+    Return the processed data with Date parsed, as stored in the Parquet copy.
+    """
+    return df.assign(Date=pd.to_datetime(df['Date']))
 
 
 def save_processed_data(df, output_path='data/formatted_sales_data.csv'):
     """
-    Save the processed DataFrame to a CSV file.
+    Save the processed DataFrame to a CSV file, plus a Parquet copy next to it
+    (with Date already parsed) for the dashboard to load without reparsing.
     """
     df.to_csv(output_path, index=False)
     print(f"Saved processed data to: {output_path}")
+    
+    parquet_path = parquet_path_for(output_path)
+    to_parquet_frame(df).to_parquet(parquet_path, engine='pyarrow', index=False)
+    print(f"Saved processed data to: {parquet_path}")
     print(f"Total records: {len(df)}")
 
 
+def stream_processed_data(data_dir='data', output_path='data/formatted_sales_data.csv'):
+    """
+    Process each CSV file in turn and append it straight to the CSV and
+    Parquet outputs, without building the combined DataFrame in memory.
+    """
+    csv_files = find_csv_files(data_dir)
+    if not csv_files:
+        raise ValueError(f"No daily_sales_data CSV files found in {data_dir}")
+    
+    parquet_path = parquet_path_for(output_path)
+    parquet_writer = None
+    total_records = 0
+    
+    try:
+        with open(output_path, 'w', newline='') as out:
+            out.write('Sales,Date,Region\n')
+            
+            for file_path in csv_files:
+                df = process_sales(read_sales_file(file_path))
+                df.to_csv(out, header=False, index=False)
+                
+                table = pa.Table.from_pandas(to_parquet_frame(df), preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(parquet_path, table.schema)
+                parquet_writer.write_table(table)
+                
+                total_records += len(df)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    
+    print(f"Saved processed data to: {output_path}")
+    print(f"Saved processed data to: {parquet_path}")
+    print(f"Total records: {total_records}")
+
+
 if __name__ == '__main__':
     # Process and save the data
-    processed_data = load_and_process_data()
-    save_processed_data(processed_data)
+    stream_processed_data()
     
     # Display sample of the data
     print("\nSample of processed data:")
-    print(processed_data.head(10))
+    print(pd.read_csv('data/formatted_sales_data.csv', nrows=10))
@@ -14,6 +14,7 @@ import pytest
 import pandas as pd
 import os
 import sys
+from collections import deque
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -21,56 +22,112 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data_processor import load_and_process_data
 
 
+@pytest.fixture(scope="module")
+def processed_data():
+    """Load and process the sales data once and share it across the tests in this module."""
+    return load_and_process_data()
+
+
 class TestDataProcessor:
     """Unit tests for the data processing functionality."""
     
-    def test_load_and_process_data_returns_dataframe(self):
+    def test_load_and_process_data_returns_dataframe(self, processed_data):
         """Test that load_and_process_data returns a pandas DataFrame."""
-        df = load_and_process_data()
+        df = processed_data
         assert isinstance(df, pd.DataFrame)
     
-    def test_data_has_required_columns(self):
+    def test_data_has_required_columns(self, processed_data):
         """Test that the processed data has Sales, Date, and Region columns."""
-        df = load_and_process_data()
+        df = processed_data
         required_columns = ['Sales', 'Date', 'Region']
         for col in required_columns:
             assert col in df.columns, f"Missing column: {col}"
     
-    def test_data_not_empty(self):
+    def test_data_not_empty(self, processed_data):
         """Test that the processed data is not empty."""
-        df = load_and_process_data()
+        df = processed_data
         assert len(df) > 0, "Processed data should not be empty"
     
-    def test_sales_values_are_numeric(self):
+    def test_sales_values_are_numeric(self, processed_data):
         """Test that Sales values are numeric and positive."""
-        df = load_and_process_data()
+        df = processed_data
         assert df['Sales'].dtype in ['float64', 'int64'], "Sales should be numeric"
         assert (df['Sales'] > 0).all(), "All sales values should be positive"
     
-    def test_region_values_are_valid(self):
+    def test_region_values_are_valid(self, processed_data):
         """Test that Region values are valid (north, south, east, west)."""
-        df = load_and_process_data()
+        df = processed_data
         valid_regions = {'north', 'south', 'east', 'west'}
         actual_regions = set(df['Region'].str.lower().unique())
         assert actual_regions.issubset(valid_regions), f"Invalid regions found: {actual_regions - valid_regions}"
     
-    def test_date_column_is_string(self):
+    def test_date_column_is_string(self, processed_data):
         """Test that the Date column contains properly formatted dates."""
-        df = load_and_process_data()
+        df = processed_data
         # Check that dates can be parsed
         try:
             pd.to_datetime(df['Date'])
         except Exception as e:
             pytest.fail(f"Date column contains invalid dates: {e}")
     
-    def test_output_file_exists(self):
+    def test_sales_keep_full_price_precision(self):
+        """Test that prices are parsed as float64, so sales carry no float32 rounding error."""
+        from data_processor import process_sales
+        raw = pd.DataFrame({
+            'product': ['pink morsel', 'pink morsel'],
+            'price': ['$2.99', '$1,234.57'],
+            'quantity': [10, 3],
+            'date': ['2021-01-01', '2021-01-01'],
+            'region': ['north', 'north']
+        })
+        df = process_sales(raw)
+        assert df['Sales'].tolist() == [10 * 2.99, 3 * 1234.57]
+    
+    def test_regions_without_pink_morsel_rows_are_dropped(self, tmp_path):
+        """Test that a region with only other products does not survive as an empty category."""
+        from data_processor import stream_processed_data
+        (tmp_path / 'daily_sales_data_0.csv').write_text(
+            "product,price,quantity,date,region\n"
+            "pink morsel,$3.00,546,2018-02-06,north\n"
+            "gold morsel,$9.99,1,2019-01-01,central\n"
+        )
+        df = load_and_process_data(data_dir=str(tmp_path))
+        assert df['Region'].cat.categories.tolist() == ['north']
+        output_path = str(tmp_path / 'formatted_sales_data.csv')
+        stream_processed_data(data_dir=str(tmp_path), output_path=output_path)
+        streamed_parquet = pd.read_parquet(str(tmp_path / 'formatted_sales_data.parquet'))
+        assert streamed_parquet['Region'].cat.categories.tolist() == ['north']
+    
+    def test_output_file_exists(self, processed_data, tmp_path):
         """Test that the output CSV file exists after processing."""
         from data_processor import save_processed_data
-        df = load_and_process_data()
-        output_path = 'data/formatted_sales_data.csv'
+        df = processed_data
+        output_path = str(tmp_path / 'formatted_sales_data.csv')
         save_processed_data(df, output_path)
         assert os.path.exists(output_path), f"Output file should exist at {output_path}"
 
+    def test_streamed_output_matches_loaded_data(self, processed_data, tmp_path):
+        """Test that streaming each file to disk produces the same data as loading it all at once."""
+        from data_processor import stream_processed_data
+        output_path = str(tmp_path / 'formatted_sales_data.csv')
+        stream_processed_data(output_path=output_path)
+        expected = processed_data.reset_index(drop=True)
+        streamed_csv = pd.read_csv(output_path)
+        streamed_parquet = pd.read_parquet(str(tmp_path / 'formatted_sales_data.parquet'))
+        assert streamed_csv['Sales'].tolist() == expected['Sales'].tolist()
+        assert streamed_csv['Date'].tolist() == expected['Date'].tolist()
+        assert streamed_csv['Region'].tolist() == expected['Region'].tolist()
+        assert len(streamed_parquet) == len(expected)
+        assert (streamed_parquet['Date'] == pd.to_datetime(expected['Date'])).all()
+
+    def test_stream_without_input_files_raises(self, tmp_path):
+        """Test that streaming an empty data directory fails instead of leaving stale output."""
+        from data_processor import stream_processed_data
+        output_path = tmp_path / 'formatted_sales_data.csv'
+        with pytest.raises(ValueError):
+            stream_processed_data(data_dir=str(tmp_path), output_path=str(output_path))
+        assert not output_path.exists()
+
 
 # ============================================================================
 # Task 5: Dash Application Tests
@@ -80,50 +137,49 @@ class TestDataProcessor:
 # 3. The region picker is present
 # ============================================================================
 
+import numpy as np
 from dash import html, dcc
-from app import app
+from app import app, split_sum, JAN15, STATS
 
 
 def find_component_by_id(layout, component_id):
     """
-    Recursively search for a component with the given ID in the layout.
+    Search the layout breadth-first for a component with the given ID.
     Returns True if found, False otherwise.
     """
-    if hasattr(layout, 'id') and layout.id == component_id:
-        return True
-    
-    if hasattr(layout, 'children'):
-        children = layout.children
+    queue = deque([layout])
+    while queue:
+        node = queue.popleft()
+        if getattr(node, 'id', None) == component_id:
+            return True
+        children = getattr(node, 'children', None)
         if children is None:
-            return False
+            continue
         if isinstance(children, (list, tuple)):
-            for child in children:
-                if find_component_by_id(child, component_id):
-                    return True
+            queue.extend(children)
         else:
-            return find_component_by_id(children, component_id)
+            queue.append(children)
     
     return False
 
 
 def find_component_by_type(layout, component_type):
     """
-    Recursively search for a component of the given type in the layout.
+    Search the layout breadth-first for a component of the given type.
     Returns True if found, False otherwise.
     """
-    if isinstance(layout, component_type):
-        return True
-    
-    if hasattr(layout, 'children'):
-        children = layout.children
+    queue = deque([layout])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, component_type):
+            return True
+        children = getattr(node, 'children', None)
         if children is None:
-            return False
+            continue
         if isinstance(children, (list, tuple)):
-            for child in children:
-                if find_component_by_type(child, component_type):
-                    return True
+            queue.extend(children)
         else:
-            return find_component_by_type(children, component_type)
+            queue.append(children)
     
     return False
 
@@ -159,5 +215,56 @@ class TestDashApp:
         assert find_component_by_id(layout, 'region-radio'), "Region picker (RadioItems with id='region-radio') should be present"
 
 
+class TestSummaryStats:
+    """Unit tests for the pre-computed summary statistics."""
+    
+    def test_split_sum_matches_mask_sums(self):
+        """Test that split_sum puts the pivot day itself in the 'after' total, like the mask sums."""
+        pivot = JAN15.to_datetime64()
+        dates = np.array(['2021-01-13', '2021-01-14', '2021-01-15', '2021-01-16'], dtype='datetime64[ns]')
+        sales = np.array([1.5, 2.0, 4.0, 8.0], dtype='float32')
+        before, after = split_sum(dates, sales, pivot)
+        assert before == sales[dates < pivot].sum(dtype='float64')
+        assert after == sales[dates >= pivot].sum(dtype='float64')
+        assert (before, after) == (3.5, 12.0)
+    
+    def test_all_region_stats_match_processed_data(self, processed_data):
+        """Test that the pre-computed 'all' stats match sums over the processed data."""
+        dates = pd.to_datetime(processed_data['Date'])
+        daily = processed_data.groupby(dates)['Sales'].sum()
+        total_sales, avg_daily_sales, before_jan15, after_jan15 = STATS['all']
+        assert total_sales == pytest.approx(processed_data['Sales'].sum())
+        assert avg_daily_sales == pytest.approx(daily.mean())
+        assert before_jan15 == pytest.approx(processed_data.loc[dates < '2021-01-15', 'Sales'].sum())
+        assert after_jan15 == pytest.approx(processed_data.loc[dates >= '2021-01-15', 'Sales'].sum())
+
+
+class TestDashCallback:
+    """Tests that the region callback serves the cached figure and summary through Dash."""
+    
+    def test_region_change_returns_cached_figure_and_summary(self):
+        """Test that posting a region change returns the region's chart title and summary."""
+        client = app.server.test_client()
+        client.get('/')
+        response = client.post('/_dash-update-component', json={
+            'output': '..sales-chart.figure...summary-stats.children..',
+            'outputs': [
+                {'id': 'sales-chart', 'property': 'figure'},
+                {'id': 'summary-stats', 'property': 'children'}
+            ],
+            'inputs': [{'id': 'region-radio', 'property': 'value', 'value': 'south'}],
+            'changedPropIds': ['region-radio.value'],
+            'state': []
+        })
+        assert response.status_code == 200
+        body = response.get_json()['response']
+        figure = body['sales-chart']['figure']
+        assert figure['layout']['title']['text'] == "Pink Morsel Sales Over Time - South Region"
+        total_sales = STATS['south'][0]
+        summary_text = str(body['summary-stats']['children'])
+        assert "Sales Summary" in summary_text
+        assert f"${total_sales:,.2f}" in summary_text
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])